@@ -1,20 +1,198 @@
 """This module provides ``kedro.config`` with the functionality to load one
 or more configuration files of yaml or json type from specified paths through OmegaConf.
 """
+import copy
+import json
 import logging
-from glob import iglob
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Set  # noqa
+from typing import Any, Dict, Iterable, Iterator, List, Pattern, Set, Tuple  # noqa
 
+import yaml
 from omegaconf import OmegaConf
+from yaml.constructor import SafeConstructor
 from yaml.parser import ParserError
+from yaml.resolver import Resolver
 from yaml.scanner import ScannerError
 
 from kedro.config import AbstractConfigLoader, MissingConfigException
 
+try:
+    from omegaconf._yaml import get_yaml_loader
+except ImportError:  # pragma: no cover
+    # omegaconf<2.4
+    from omegaconf._utils import get_yaml_loader
+
 _config_logger = logging.getLogger(__name__)
 
+_VALID_SUFFIXES = (".yml", ".yaml", ".json")
+_BUILTIN_RESOLVERS = (
+    "oc.env",
+    "oc.create",
+    "oc.deprecated",
+    "oc.decode",
+    "oc.select",
+    "oc.dict.keys",
+    "oc.dict.values",
+)
+_MAX_LOAD_WORKERS = 8
+
+_GLOB_MAGIC = re.compile(r"[*?[]")
+_SET_SPECIAL = re.compile(r"([\[&~|])")
+# Like ``fnmatch``, which compares ``os.path.normcase``-d names, match patterns
+# case-insensitively on platforms with case-insensitive paths such as Windows
+_PATTERN_FLAGS = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+# ``**`` in the middle of a pattern matches zero or more non-hidden directories,
+# at the end of a pattern it matches anything below the current directory
+_ANY_DIRS = r"(?:(?!\.)[^/]+/)*"
+_ANY_PATH = r"(?:(?!\.)[^/]+(?:/(?!\.)[^/]+)*)?"
+
+
+def _get_yaml_loader():
+    """Get the YAML loader ``OmegaConf.load`` uses, backed by the much faster LibYAML
+    parser when PyYAML was built with it."""
+    omegaconf_loader = get_yaml_loader()
+    if not yaml.__with_libyaml__:  # pragma: no cover
+        return omegaconf_loader
+
+    from yaml.cyaml import CParser  # pylint: disable=import-outside-toplevel
+
+    if issubclass(omegaconf_loader, CParser):
+        # Newer OmegaConf versions parse with LibYAML themselves
+        return omegaconf_loader
+
+    # Parse in C, but construct and resolve the values like OmegaConf does
+    class _CYamlLoader(CParser, omegaconf_loader):  # pylint: disable=too-many-ancestors
+        # pylint: disable=super-init-not-called,non-parent-init-called
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+    return _CYamlLoader
+
+
+_YAML_LOADER = _get_yaml_loader()
+
+
+def _unique_keys_dict(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Build a JSON object, rejecting duplicate keys as OmegaConf does for YAML."""
+    obj = dict(pairs)
+    if len(obj) != len(pairs):
+        raise ValueError("Duplicate keys found in JSON object")
+    return obj
+
+
+def _reject_constant(name: str):
+    """Reject the non-standard ``NaN`` and ``Infinity`` constants in JSON, YAML reads
+    them as strings instead."""
+    raise ValueError(f"Non-standard JSON constant '{name}'")
+
+
+def _walk_conf(conf_path: str, prefix: str = "") -> Iterator[Tuple[str, os.DirEntry]]:
+    """Recursively walk ``conf_path`` with ``os.scandir``, yielding
+    ``(path, entry)`` once for every entry found, where ``path`` is
+    relative to ``conf_path`` and uses forward slashes.
+
+    Raises ``OSError`` if ``conf_path`` itself can't be scanned, subdirectories
+    which can't be scanned are skipped.
+    """
+    with os.scandir(conf_path) as entries:
+        for entry in entries:
+            path = prefix + entry.name
+            yield path, entry
+            if entry.is_dir():
+                try:
+                    yield from _walk_conf(entry.path, f"{path}/")
+                except OSError:
+                    continue
+
+
+def _translate_glob_part(part: str) -> str:
+    """Translate a single path component of a glob pattern into a regex.
+    Wildcards never match a ``/`` and, as with ``glob``, hidden entries are
+    only matched by components starting with a dot."""
+    regex = "" if part.startswith(".") else r"(?!\.)"
+    i, length = 0, len(part)
+    while i < length:
+        char = part[i]
+        i += 1
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            j = i
+            if j < length and part[j] == "!":
+                j += 1
+            if j < length and part[j] == "]":
+                j += 1
+            j = part.find("]", j)
+            if j < 0:
+                regex += r"\["
+                continue
+            chars = part[i:j].replace("\\", r"\\")
+            # Escape nested sets and set operations, as ``fnmatch`` does
+            chars = _SET_SPECIAL.sub(r"\\\1", chars)
+            i = j + 1
+            if chars[0] == "!":
+                chars = "^" + chars[1:]
+            elif chars[0] == "^":
+                chars = "\\" + chars
+            regex += f"[{chars}]"
+        else:
+            regex += re.escape(char)
+    return regex
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a recursive glob pattern into a regex matching paths relative
+    to the directory the pattern is evaluated in."""
+    parts = pattern.split("/")
+    regex = ""
+    for i, part in enumerate(parts, 1):
+        is_last = i == len(parts)
+        if part == "**":
+            regex += _ANY_PATH if is_last else _ANY_DIRS
+        else:
+            regex += _translate_glob_part(part) + ("" if is_last else "/")
+    return regex
+
+
+@lru_cache(maxsize=None)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Dict[str, Pattern]:
+    """Compile glob patterns into one regex per directory that has to be walked.
+    Compiled patterns are memoised, as the same patterns are used for every lookup.
+
+    The leading wildcard-free components of each pattern (e.g. ``..``) are split
+    off as the root to walk from, so that every root is walked only once no matter
+    how many patterns start from it.
+    """
+    regexes: Dict[str, List[str]] = {}
+    for pattern in patterns:
+        parts = pattern.split("/")
+        root_length = 0
+        while root_length < len(parts) - 1 and not _GLOB_MAGIC.search(
+            parts[root_length]
+        ):
+            root_length += 1
+        root = "".join(f"{part}/" for part in parts[:root_length])
+        regexes.setdefault(root, []).append(
+            _translate_glob("/".join(parts[root_length:]))
+        )
+    return {
+        root: re.compile(
+            "(?s:" + "|".join(f"(?:{each})" for each in group) + r")\Z", _PATTERN_FLAGS
+        )
+        for root, group in regexes.items()
+    }
 
+
+# pylint: disable=too-many-instance-attributes
 class OmegaConfLoader(AbstractConfigLoader):
     """Recursively scan directories (config paths) contained in ``conf_source`` for
     configuration files with a ``yaml``, ``yml`` or ``json`` extension, load and merge
@@ -32,6 +210,9 @@ class OmegaConfLoader(AbstractConfigLoader):
     (sub)directories, the last processed config path takes precedence
     and overrides this key and any sub-keys.
 
+    The configuration for each key is loaded once and cached on the loader. Call
+    ``clear_cache`` to pick up changes made to the config files afterwards.
+
     You can access the different configurations as follows:
     ::
 
@@ -108,6 +289,20 @@ class OmegaConfLoader(AbstractConfigLoader):
         # It's easier to introduce them step by step, but removing them would be a breaking change.
         self._clear_omegaconf_resolvers()
 
+        # Parsed contents of every config file read so far, keyed by path and
+        # invalidated when the file's modification time or size changes.
+        self._file_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        # Files found in every directory walked so far, relative to that directory.
+        # All keys are matched against the same listing instead of walking again.
+        self._scan_cache: Dict[str, List[Tuple[str, Tuple[int, int]]]] = {}
+        # Fully merged configuration for every key, its patterns and pair of config
+        # paths looked up
+        self._result_cache: Dict[
+            Tuple[str, Tuple[str, ...], str, str], Dict[str, Any]
+        ] = {}
+        self._config_paths_key: Tuple[Any, ...] = ()
+        self._config_paths: Tuple[str, str] = ("", "")
+
         super().__init__(
             conf_source=conf_source,
             env=env,
@@ -126,6 +321,8 @@ class OmegaConfLoader(AbstractConfigLoader):
                OmegaConfLoader instance.
             MissingConfigException: If no configuration files exist matching the patterns
                 mapped to the provided key.
+            InterpolationResolutionError: If an interpolation in the combined
+                configuration can't be resolved.
 
         Returns:
             Dict[str, Any]:  A Python dictionary with the combined
@@ -141,36 +338,69 @@ class OmegaConfLoader(AbstractConfigLoader):
             raise KeyError(
                 f"No config patterns were found for '{key}' in your config loader"
             )
-        patterns = [*self.config_patterns[key]]
+
+        patterns = tuple(self.config_patterns[key])
+        base_path, env_path = self._get_config_paths()
+        cache_key = (key, patterns, base_path, env_path)
+        # Callers are free to modify the config they get, so hand out copies
+        if cache_key in self._result_cache:
+            return copy.deepcopy(self._result_cache[cache_key])
 
         # Load base env config
-        base_path = str(Path(self.conf_source) / self.base_env)
         base_config = self.load_and_merge_dir_config(base_path, patterns)
-        config = base_config
 
         # Load chosen env config
-        run_env = self.env or self.default_run_env
-        env_path = str(Path(self.conf_source) / run_env)
         env_config = self.load_and_merge_dir_config(env_path, patterns)
 
         # Destructively merge the two env dirs. The chosen env will override base.
-        common_keys = config.keys() & env_config.keys()
-        if common_keys:
-            sorted_keys = ", ".join(sorted(common_keys))
-            msg = (
-                "Config from path '%s' will override the following "
-                "existing top-level config keys: %s"
-            )
-            _config_logger.debug(msg, env_path, sorted_keys)
-
-        config.update(env_config)
+        # Often only one of them contains config for the key, then there's nothing to merge.
+        if not env_config:
+            config = base_config
+        elif not base_config:
+            config = env_config
+        else:
+            common_keys = base_config.keys() & env_config.keys()
+            if common_keys:
+                sorted_keys = ", ".join(sorted(common_keys))
+                msg = (
+                    "Config from path '%s' will override the following "
+                    "existing top-level config keys: %s"
+                )
+                _config_logger.debug(msg, env_path, sorted_keys)
+
+            config = base_config
+            config.update(env_config)
 
         if not config:
             raise MissingConfigException(
                 f"No files of YAML or JSON format found in {base_path} or {env_path} matching"
                 f" the glob pattern(s): {[*self.config_patterns[key]]}"
             )
-        return config
+        # Convert to plain containers once both env dirs are merged, so interpolations
+        # resolve against the overridden values and later access doesn't go through
+        # OmegaConf nodes.
+        config = OmegaConf.to_container(config, resolve=True)
+        self._result_cache[cache_key] = config
+        return copy.deepcopy(config)
+
+    def _get_config_paths(self) -> Tuple[str, str]:
+        """Get the base and run env config paths, only building them again once
+        ``conf_source`` or any of the environments changed."""
+        paths_key = (self.conf_source, self.base_env, self.env, self.default_run_env)
+        if paths_key != self._config_paths_key:
+            run_env = self.env or self.default_run_env
+            self._config_paths = (
+                str(Path(self.conf_source) / self.base_env),
+                str(Path(self.conf_source) / run_env),
+            )
+            self._config_paths_key = paths_key
+        return self._config_paths
+
+    def clear_cache(self):
+        """Clear the configuration cached by previous lookups, so that the next
+        lookup of every key finds and loads its config files again."""
+        self._scan_cache.clear()
+        self._result_cache.clear()
 
     def __repr__(self):  # pragma: no cover
         return (
@@ -195,72 +425,152 @@ class OmegaConfLoader(AbstractConfigLoader):
             Resulting configuration dictionary.
 
         """
-        if not Path(conf_path).is_dir():
-            raise MissingConfigException(
-                f"Given configuration path either does not exist "
-                f"or is not a valid directory: {conf_path}"
-            )
+        config_files_filtered = self._find_config_files(
+            conf_path, _compile_patterns(tuple(patterns))
+        )
 
-        paths = [
-            Path(each).resolve()
-            for pattern in patterns
-            for each in iglob(f"{str(conf_path)}/{pattern}", recursive=True)
-        ]
-        deduplicated_paths = set(paths)
-        config_files_filtered = [
-            path for path in deduplicated_paths if self._is_valid_config_path(path)
-        ]
+        if len(config_files_filtered) > 1:
+            # Loading the files is independent work, let their reads overlap
+            with ThreadPoolExecutor(
+                max_workers=min(_MAX_LOAD_WORKERS, len(config_files_filtered))
+            ) as executor:
+                configs = list(
+                    executor.map(self._load_config_file, config_files_filtered)
+                )
+        else:
+            configs = [self._load_config_file(each) for each in config_files_filtered]
 
         config_per_file = {}
-
-        for config_filepath in config_files_filtered:
-            try:
-                config = OmegaConf.load(config_filepath)
-                config_per_file[config_filepath] = config
-            except (ParserError, ScannerError) as exc:
-                line = exc.problem_mark.line  # type: ignore
-                cursor = exc.problem_mark.column  # type: ignore
-                raise ParserError(
-                    f"Invalid YAML or JSON file {config_filepath}, unable to read line {line}, "
-                    f"position {cursor}."
-                ) from exc
-
-        seen_file_to_keys = {
-            file: set(config.keys()) for file, config in config_per_file.items()
-        }
-        aggregate_config = config_per_file.values()
+        seen_file_to_keys = {}
+        for config_filepath, config in zip(config_files_filtered, configs):
+            config_per_file[config_filepath] = config
+            seen_file_to_keys[config_filepath] = set(config.keys())
         self._check_duplicates(seen_file_to_keys)
 
-        if not aggregate_config:
+        if not config_per_file:
             return {}
-        if len(aggregate_config) == 1:
-            return list(aggregate_config)[0]
-        return dict(OmegaConf.merge(*aggregate_config))
+        if len(config_per_file) == 1:
+            merged_config = next(iter(config_per_file.values()))
+        else:
+            # The per-file configs are loaded fresh and discarded afterwards, so they
+            # can be merged in place instead of paying for OmegaConf's defensive deepcopy.
+            merged_config = OmegaConf.unsafe_merge(*config_per_file.values())
+        return merged_config
+
+    def _find_config_files(
+        self, conf_path: str, compiled_patterns: Dict[str, Pattern]
+    ) -> List[Path]:
+        """Find the config files in ``conf_path`` matching the compiled patterns."""
+        # Scanning ``conf_path`` itself doubles as the check that it exists
+        try:
+            self._list_files(f"{conf_path}/")
+        except (FileNotFoundError, NotADirectoryError) as exc:
+            raise MissingConfigException(
+                f"Given configuration path either does not exist "
+                f"or is not a valid directory: {conf_path}"
+            ) from exc
+
+        # The same file can be found through overlapping roots, e.g. ``..``, or under
+        # several names through symlinks, so deduplicate by the file's identity
+        deduplicated_paths: Dict[Tuple[int, int], str] = {}
+        for root, regex in compiled_patterns.items():
+            root_path = f"{conf_path}/{root}"
+            try:
+                files = self._list_files(root_path)
+            except OSError:
+                # Like globbing, ignore roots which can't be scanned
+                continue
+            for path, file_id in files:
+                if regex.match(path):
+                    deduplicated_paths.setdefault(file_id, root_path + path)
+        return [Path(os.path.abspath(path)) for path in deduplicated_paths.values()]
+
+    def _list_files(self, directory: str) -> List[Tuple[str, Tuple[int, int]]]:
+        """List the config files below ``directory`` alongside their device and inode
+        numbers, walking it only the first time."""
+        key = os.path.normpath(directory)
+        if key not in self._scan_cache:
+            files = []
+            for path, entry in _walk_conf(directory):
+                if self._is_valid_config_path(entry):
+                    # Unlike ``os.stat``, ``DirEntry.stat`` reports no device and inode
+                    # numbers on Windows
+                    stat = os.stat(entry.path)
+                    files.append((path, (stat.st_dev, stat.st_ino)))
+            self._scan_cache[key] = sorted(files)
+        return self._scan_cache[key]
+
+    def _load_config_file(self, config_filepath: Path):
+        """Load a single config file into OmegaConf, reusing the previously
+        parsed contents if the file hasn't changed since it was last read."""
+        stat = config_filepath.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_cache.get(config_filepath)
+        if cached is None or cached[0] != signature:
+            cached = (signature, self._parse_config_file(config_filepath))
+            self._file_cache[config_filepath] = cached
+
+        # Build a fresh node tree, the merge modifies its inputs in place
+        return OmegaConf.create(cached[1])
+
+    @staticmethod
+    def _parse_config_file(config_filepath: Path):
+        """Parse a config file the same way as ``OmegaConf.load``."""
+        if config_filepath.suffix == ".json":
+            try:
+                return json.loads(
+                    config_filepath.read_bytes(),
+                    object_pairs_hook=_unique_keys_dict,
+                    parse_constant=_reject_constant,
+                )
+            except ValueError:
+                # Not strictly valid JSON, leave it to the YAML parser to either
+                # load it anyway or report where the problem is
+                pass
+
+        try:
+            with open(config_filepath, encoding="utf-8") as config_file:
+                config = yaml.load(config_file, Loader=_YAML_LOADER)  # nosec
+        except (ParserError, ScannerError) as exc:
+            line = exc.problem_mark.line  # type: ignore
+            cursor = exc.problem_mark.column  # type: ignore
+            raise ParserError(
+                f"Invalid YAML or JSON file {config_filepath}, unable to read line {line}, "
+                f"position {cursor}."
+            ) from exc
+        return {} if config is None else config
 
     @staticmethod
-    def _is_valid_config_path(path):
-        """Check if given path is a file path and file type is yaml or json."""
-        return path.is_file() and path.suffix in [".yml", ".yaml", ".json"]
+    def _is_valid_config_path(entry: os.DirEntry):
+        """Check if given directory entry is a file and file type is yaml or json."""
+        return entry.name.endswith(_VALID_SUFFIXES) and entry.is_file()
 
     @staticmethod
     def _check_duplicates(seen_files_to_keys: Dict[Path, Set[Any]]):
+        key_to_files: Dict[Any, List[Path]] = defaultdict(list)
+        for filepath, keys in seen_files_to_keys.items():
+            for key in keys:
+                key_to_files[key].append(filepath)
+
+        overlapping_keys: Dict[Tuple[Path, Path], Set[Any]] = defaultdict(set)
+        for key, filepaths in key_to_files.items():
+            for i, filepath1 in enumerate(filepaths, 1):
+                for filepath2 in filepaths[i:]:
+                    overlapping_keys[(filepath1, filepath2)].add(key)
+
+        # Report the pairs of files in the order in which they were loaded
+        file_order = {filepath: i for i, filepath in enumerate(seen_files_to_keys)}
         duplicates = []
-
-        filepaths = list(seen_files_to_keys.keys())
-        for i, filepath1 in enumerate(filepaths, 1):
-            config1 = seen_files_to_keys[filepath1]
-            for filepath2 in filepaths[i:]:
-                config2 = seen_files_to_keys[filepath2]
-
-                overlapping_keys = config1 & config2
-
-                if overlapping_keys:
-                    sorted_keys = ", ".join(sorted(overlapping_keys))
-                    if len(sorted_keys) > 100:
-                        sorted_keys = sorted_keys[:100] + "..."
-                    duplicates.append(
-                        f"Duplicate keys found in {filepath1} and {filepath2}: {sorted_keys}"
-                    )
+        for (filepath1, filepath2), keys in sorted(
+            overlapping_keys.items(),
+            key=lambda item: (file_order[item[0][0]], file_order[item[0][1]]),
+        ):
+            sorted_keys = ", ".join(sorted(keys))
+            if len(sorted_keys) > 100:
+                sorted_keys = sorted_keys[:100] + "..."
+            duplicates.append(
+                f"Duplicate keys found in {filepath1} and {filepath2}: {sorted_keys}"
+            )
 
         if duplicates:
             dup_str = "\n".join(duplicates)
@@ -268,11 +578,8 @@ class OmegaConfLoader(AbstractConfigLoader):
 
     @staticmethod
     def _clear_omegaconf_resolvers():
-        """Clear the built-in OmegaConf resolvers."""
-        OmegaConf.clear_resolver("oc.env")
-        OmegaConf.clear_resolver("oc.create")
-        OmegaConf.clear_resolver("oc.deprecated")
-        OmegaConf.clear_resolver("oc.decode")
-        OmegaConf.clear_resolver("oc.select")
-        OmegaConf.clear_resolver("oc.dict.keys")
-        OmegaConf.clear_resolver("oc.dict.values")
+        """Clear the built-in OmegaConf resolvers. Resolvers are registered process-wide,
+        so usually only the first ``OmegaConfLoader`` finds any left to clear."""
+        for name in _BUILTIN_RESOLVERS:
+            if OmegaConf.has_resolver(name):
+                OmegaConf.clear_resolver(name)
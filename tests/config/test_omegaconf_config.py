@@ -1,15 +1,21 @@
 # pylint: disable=expression-not-assigned, pointless-statement
 import configparser
 import json
+import os
 import re
+import sys
+import warnings
 from pathlib import Path
 from typing import Dict
 
 import pytest
 import yaml
+from omegaconf.errors import InterpolationKeyError, UnsupportedInterpolationType
+from yaml.constructor import ConstructorError
 from yaml.parser import ParserError
 
 from kedro.config import MissingConfigException, OmegaConfLoader
+from kedro.config.omegaconf_config import _compile_patterns, _walk_conf
 
 _DEFAULT_RUN_ENV = "local"
 _BASE_ENV = "base"
@@ -86,7 +92,40 @@ def proj_catalog_nested(tmp_path):
     _write_yaml(path, {"nested": {"type": "MemoryDataSet"}})
 
 
+@pytest.fixture
+def pattern_flags(mocker):
+    """Set the flags config patterns are compiled with, e.g. to match like on Windows"""
+
+    def _set_flags(flags):
+        mocker.patch("kedro.config.omegaconf_config._PATTERN_FLAGS", flags)
+        _compile_patterns.cache_clear()
+
+    yield _set_flags
+    _compile_patterns.cache_clear()
+
+
 use_config_dir = pytest.mark.usefixtures("create_config_dir")
+SKIP_ON_WINDOWS = pytest.mark.skipif(
+    sys.platform.startswith("win"),
+    reason="Creating symlinks needs elevated rights on Windows",
+)
+
+
+class _WindowsDirEntry:
+    """Mimic ``os.DirEntry`` on Windows, where ``stat`` has no device and inode numbers"""
+
+    def __init__(self, entry):
+        self._entry = entry
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def stat(self, **kwargs):
+        values = list(self._entry.stat(**kwargs))
+        values[1] = values[2] = 0
+        return os.stat_result(values)
+
+
 use_proj_catalog = pytest.mark.usefixtures("proj_catalog")
 
 
@@ -421,3 +460,356 @@ class TestOmegaConfLoader:
         conf["catalog"] = {"catalog_config": "something_new"}
 
         assert conf["catalog"] == {"catalog_config": "something_new"}
+
+    @use_config_dir
+    def test_unchanged_files_are_parsed_once(self, tmp_path, mocker):
+        """Make sure config files are only parsed again once they change on disk."""
+        conf = OmegaConfLoader(str(tmp_path))
+        mocked_load = mocker.spy(yaml, "load")
+
+        conf["catalog"]
+        conf.clear_cache()
+        conf["catalog"]
+        assert mocked_load.call_count == 2
+
+        _write_yaml(tmp_path / _BASE_ENV / "catalog.yml", {"planes": {"type": "x"}})
+        conf.clear_cache()
+        catalog = conf["catalog"]
+        assert mocked_load.call_count == 3
+        assert catalog.keys() == {"planes", "cars", "boats"}
+
+    @use_proj_catalog
+    def test_hidden_dirs_are_not_loaded(self, tmp_path, base_config):
+        """Check that, as with recursive globbing, files in hidden directories
+        don't match the default patterns"""
+        _write_yaml(
+            tmp_path / _BASE_ENV / ".ipynb_checkpoints" / "catalog-checkpoint.yml",
+            base_config,
+        )
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir(exist_ok=True)
+
+        assert OmegaConfLoader(str(tmp_path))["catalog"] == base_config
+
+    @use_config_dir
+    def test_bad_config_syntax_among_several_files(self, tmp_path):
+        """Check the error when one of several config files can't be parsed"""
+        conf_path = tmp_path / _BASE_ENV
+        _write_yaml(conf_path / "catalog_good.yml", {"planes": {"type": "x"}})
+        (conf_path / "catalog_bad.yml").write_text("bad:\nconfig")
+
+        pattern = f"Invalid YAML or JSON file {conf_path / 'catalog_bad.yml'}"
+        with pytest.raises(ParserError, match=re.escape(pattern)):
+            OmegaConfLoader(str(tmp_path))["catalog"]
+
+    @use_config_dir
+    def test_config_is_cached_per_key(self, tmp_path, mocker):
+        """Make sure repeated lookups of a key don't load its config files again,
+        and that modifying the returned config doesn't affect later lookups"""
+        conf = OmegaConfLoader(str(tmp_path))
+        mocked_load = mocker.spy(conf, "load_and_merge_dir_config")
+
+        catalog = conf["catalog"]
+        catalog["trains"]["type"] = "pandas.CSVDataSet"
+        catalog.pop("cars")
+
+        catalog = conf["catalog"]
+        assert mocked_load.call_count == 2
+        assert catalog["trains"]["type"] == "MemoryDataSet"
+        assert "cars" in catalog
+
+    @use_config_dir
+    def test_clear_cache(self, tmp_path):
+        """Make sure config files changed after a lookup are picked up once the
+        cache is cleared"""
+        conf = OmegaConfLoader(str(tmp_path))
+        assert "planes" not in conf["catalog"]
+
+        _write_yaml(tmp_path / _BASE_ENV / "catalog_planes.yml", {"planes": {}})
+        assert "planes" not in conf["catalog"]
+
+        conf.clear_cache()
+        assert "planes" in conf["catalog"]
+
+    @use_config_dir
+    def test_config_dirs_are_walked_once(self, tmp_path, mocker):
+        """Make sure looking up several keys only walks each config directory once"""
+        mocked_walk = mocker.patch(
+            "kedro.config.omegaconf_config._walk_conf", wraps=_walk_conf
+        )
+        conf = OmegaConfLoader(str(tmp_path))
+        conf["catalog"]
+        conf["parameters"]
+
+        walked = [args[0] for args, _ in mocked_walk.call_args_list]
+        assert walked == [f"{tmp_path / _BASE_ENV}/", f"{tmp_path / _DEFAULT_RUN_ENV}/"]
+
+    def test_load_config_with_interpolation(self, tmp_path):
+        """Make sure interpolations are resolved and plain dictionaries are returned"""
+        _write_yaml(
+            tmp_path / _BASE_ENV / "catalog.yml",
+            {
+                "_csv": {"type": "pandas.CSVDataSet"},
+                "cars": {"type": "${_csv.type}", "filepath": "data/cars.csv"},
+            },
+        )
+        _write_yaml(tmp_path / _BASE_ENV / "catalog_boats.yml", {"boats": "${cars}"})
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+
+        catalog = OmegaConfLoader(str(tmp_path))["catalog"]
+        assert catalog["cars"] == {
+            "type": "pandas.CSVDataSet",
+            "filepath": "data/cars.csv",
+        }
+        assert catalog["boats"] == catalog["cars"]
+        assert isinstance(catalog["boats"], dict)
+
+    def test_interpolation_resolved_after_env_override(self, tmp_path):
+        """Make sure base env interpolations resolve against the values of the run env"""
+        _write_yaml(
+            tmp_path / _BASE_ENV / "parameters.yml",
+            {"lr": 0.1, "model": {"lr": "${lr}", "epochs": "${epochs}"}},
+        )
+        _write_yaml(
+            tmp_path / _DEFAULT_RUN_ENV / "parameters.yml", {"lr": 0.01, "epochs": 5}
+        )
+
+        params = OmegaConfLoader(str(tmp_path))["parameters"]
+        assert params["model"] == {"lr": 0.01, "epochs": 5}
+
+    @pytest.mark.parametrize(
+        "value, error",
+        [
+            ("${missing}", InterpolationKeyError),
+            ("${oc.env:KEDRO_TEST_UNSET}", UnsupportedInterpolationType),
+        ],
+    )
+    def test_unresolvable_interpolation(self, tmp_path, value, error):
+        """Check the error when an interpolation can't be resolved, since configuration
+        is resolved as a whole when it's looked up"""
+        _write_yaml(
+            tmp_path / _BASE_ENV / "parameters.yml", {"param1": 1, "unused": value}
+        )
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+
+        with pytest.raises(error):
+            OmegaConfLoader(str(tmp_path))["parameters"]
+
+    def test_yaml_parsed_like_omegaconf(self, tmp_path):
+        """Make sure YAML files are parsed with the same rules as ``OmegaConf.load``"""
+        (tmp_path / _BASE_ENV).mkdir()
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        (tmp_path / _BASE_ENV / "parameters.yml").write_text(
+            "rate: 1e-3\nstart: 2023-01-01\nflag: yes\n"
+        )
+
+        params = OmegaConfLoader(str(tmp_path))["parameters"]
+        assert params == {"rate": 0.001, "start": "2023-01-01", "flag": True}
+
+    def test_yaml_alias_expansion_limited(self, tmp_path):
+        """Make sure YAML aliases are expanded within the limits of ``OmegaConf.load``"""
+        pytest.importorskip("omegaconf._yaml", reason="omegaconf<2.4 has no limits")
+        lines = ["l0: &l0 [x, x, x, x, x, x, x, x, x, x]"]
+        lines += [
+            f"l{i}: &l{i} [{', '.join([f'*l{i - 1}'] * 10)}]" for i in range(1, 5)
+        ]
+        parameters = tmp_path / _BASE_ENV / "parameters.yml"
+        parameters.parent.mkdir()
+        parameters.write_text("\n".join(lines))
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+
+        with pytest.raises(ConstructorError, match="YAML node expansion exceeds"):
+            OmegaConfLoader(str(tmp_path))["parameters"]
+
+    def test_duplicate_keys_in_same_file(self, tmp_path):
+        """Check the error if a YAML file defines the same key twice"""
+        (tmp_path / _BASE_ENV).mkdir()
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        (tmp_path / _BASE_ENV / "parameters.yml").write_text("rate: 1\nrate: 2\n")
+
+        with pytest.raises(ConstructorError, match="found duplicate key rate"):
+            OmegaConfLoader(str(tmp_path))["parameters"]
+
+    def test_bad_json_syntax(self, tmp_path):
+        """Check the error when a JSON config file can't be parsed"""
+        conf_path = tmp_path / _BASE_ENV
+        conf_path.mkdir()
+        (conf_path / "parameters.json").write_text('{"param1": 1,\n "param2": [}')
+
+        pattern = f"Invalid YAML or JSON file {conf_path / 'parameters.json'}"
+        with pytest.raises(ParserError, match=re.escape(pattern)):
+            OmegaConfLoader(str(tmp_path))["parameters"]
+
+    def test_duplicate_keys_in_same_json_file(self, tmp_path):
+        """Check the error if a JSON file defines the same key twice"""
+        (tmp_path / _BASE_ENV).mkdir()
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        (tmp_path / _BASE_ENV / "parameters.json").write_text('{"a": 1, "a": 2}')
+
+        with pytest.raises(ConstructorError, match="found duplicate key a"):
+            OmegaConfLoader(str(tmp_path))["parameters"]
+
+    def test_json_constants_parsed_like_yaml(self, tmp_path):
+        """Make sure non-standard JSON constants are read the same as by ``OmegaConf.load``"""
+        (tmp_path / _BASE_ENV).mkdir()
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        (tmp_path / _BASE_ENV / "parameters.json").write_text(
+            '{"nan": NaN, "inf": Infinity, "float": 1.5}'
+        )
+
+        params = OmegaConfLoader(str(tmp_path))["parameters"]
+        assert params == {"nan": "NaN", "inf": "Infinity", "float": 1.5}
+
+    def test_config_path_is_a_file(self, tmp_path):
+        """Check the error when a config path is a file rather than a directory"""
+        (tmp_path / _BASE_ENV).write_text("catalog: {}")
+
+        pattern = (
+            r"Given configuration path either does not exist "
+            r"or is not a valid directory\: .*base"
+        )
+        with pytest.raises(MissingConfigException, match=pattern):
+            OmegaConfLoader(str(tmp_path))["catalog"]
+
+    def test_set_operations_in_patterns(self, tmp_path):
+        """Make sure characters inside ``[...]`` in a pattern are matched literally"""
+        _write_yaml(tmp_path / _BASE_ENV / "params[1].yml", {"param1": 1})
+        _write_yaml(tmp_path / _BASE_ENV / "params&2.yml", {"param2": 2})
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            conf = OmegaConfLoader(
+                str(tmp_path),
+                config_patterns={"params": ["params[[]1].yml", "params[&~|]*"]},
+            )
+            assert conf["params"] == {"param1": 1, "param2": 2}
+
+    @use_config_dir
+    def test_config_patterns_changed_after_init(self, tmp_path):
+        """Make sure changes to ``config_patterns`` after instantiation are used"""
+        _write_yaml(tmp_path / _BASE_ENV / "params.yml", {"param3": 3})
+        conf = OmegaConfLoader(str(tmp_path))
+        conf.config_patterns["parameters"] = ["params*"]
+
+        assert conf["parameters"] == {"param3": 3}
+
+    @pytest.mark.parametrize("flags, found", [(re.IGNORECASE, True), (0, False)])
+    def test_patterns_match_case_like_platform(
+        self, tmp_path, pattern_flags, flags, found
+    ):
+        """Make sure config file names are matched regardless of case only where
+        paths are case-insensitive, as on Windows"""
+        pattern_flags(flags)
+        _write_yaml(tmp_path / _BASE_ENV / "Catalog.yml", {"cars": {"type": "a"}})
+        _write_yaml(tmp_path / _BASE_ENV / "PARAMETERS.yml", {"param1": 1})
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        conf = OmegaConfLoader(str(tmp_path))
+
+        if found:
+            assert conf["catalog"] == {"cars": {"type": "a"}}
+            assert conf["parameters"] == {"param1": 1}
+        else:
+            with pytest.raises(MissingConfigException):
+                conf["catalog"]
+
+    def test_patterns_match_case_on_this_platform(self, tmp_path):
+        """Check that config file names are matched with the case sensitivity of
+        the platform's paths, as ``glob`` does"""
+        _write_yaml(tmp_path / _BASE_ENV / "Catalog.yml", {"cars": {"type": "a"}})
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        conf = OmegaConfLoader(str(tmp_path))
+
+        if os.path.normcase("A") == "a":
+            assert conf["catalog"] == {"cars": {"type": "a"}}
+        else:
+            with pytest.raises(MissingConfigException):
+                conf["catalog"]
+
+    def test_config_pattern_key_added_after_init(self, tmp_path):
+        """Make sure a key added to ``config_patterns`` after instantiation can be loaded"""
+        _write_yaml(tmp_path / _BASE_ENV / "spark.yml", {"spark.driver.memory": "1g"})
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        conf = OmegaConfLoader(str(tmp_path))
+        conf.config_patterns["spark"] = ["spark*"]
+
+        assert conf["spark"] == {"spark.driver.memory": "1g"}
+
+    @use_config_dir
+    def test_config_patterns_changed_after_lookup(self, tmp_path):
+        """Make sure changes to ``config_patterns`` after a lookup are used by the next one"""
+        _write_yaml(tmp_path / _BASE_ENV / "params.yml", {"param3": 3})
+        conf = OmegaConfLoader(str(tmp_path))
+        assert conf["parameters"] == {"param1": 1, "param2": 2}
+
+        conf.config_patterns["parameters"] = ["params*"]
+        assert conf["parameters"] == {"param3": 3}
+
+    def test_distinct_files_without_inode_numbers(self, tmp_path, mocker):
+        """Check that all distinct config files are loaded when ``os.DirEntry.stat``
+        reports no inode numbers, as on Windows"""
+        _write_yaml(tmp_path / _BASE_ENV / "catalog.yml", {"cars": {"type": "a"}})
+        _write_yaml(tmp_path / _BASE_ENV / "catalog_x.yml", {"boats": {"type": "b"}})
+        (tmp_path / _DEFAULT_RUN_ENV).mkdir()
+        mocker.patch(
+            "kedro.config.omegaconf_config._walk_conf",
+            side_effect=lambda conf_path, prefix="": (
+                (path, _WindowsDirEntry(entry))
+                for path, entry in _walk_conf(conf_path, prefix)
+            ),
+        )
+
+        catalog = OmegaConfLoader(str(tmp_path))["catalog"]
+        assert catalog == {"cars": {"type": "a"}, "boats": {"type": "b"}}
+
+    @SKIP_ON_WINDOWS
+    @use_config_dir
+    def test_symlinked_file_loaded_once(self, tmp_path):
+        """Check that a symlink next to the config file it points to isn't loaded twice"""
+        (tmp_path / _BASE_ENV / "parameters_link.json").symlink_to(
+            tmp_path / _BASE_ENV / "parameters.json"
+        )
+
+        params = OmegaConfLoader(str(tmp_path))["parameters"]
+        assert params == {"param1": 1, "param2": 2}
+
+    @SKIP_ON_WINDOWS
+    @use_config_dir
+    def test_symlinked_dir_loaded_once(self, tmp_path):
+        """Check that config files reachable through a symlinked directory aren't
+        loaded twice"""
+        _write_yaml(tmp_path / _BASE_ENV / "parameters" / "nested.yml", {"param3": 3})
+        (tmp_path / _BASE_ENV / "parameters_link").symlink_to(
+            tmp_path / _BASE_ENV / "parameters", target_is_directory=True
+        )
+
+        params = OmegaConfLoader(str(tmp_path))["parameters"]
+        assert params == {"param1": 1, "param2": 2, "param3": 3}
+
+    def test_relative_conf_source_absolute_paths_in_errors(
+        self, tmp_path, monkeypatch, base_config
+    ):
+        """Check that errors show absolute paths when ``conf_source`` is relative"""
+        _write_yaml(tmp_path / "conf" / _BASE_ENV / "catalog.yml", base_config)
+        _write_yaml(tmp_path / "conf" / _BASE_ENV / "catalog_dup.yml", base_config)
+        monkeypatch.chdir(tmp_path)
+
+        conf_path = re.escape(str(tmp_path / "conf" / _BASE_ENV))
+        pattern = (
+            rf"Duplicate keys found in {conf_path}.catalog(_dup)?\.yml "
+            rf"and {conf_path}.catalog(_dup)?\.yml"
+        )
+        with pytest.raises(ValueError, match=pattern):
+            OmegaConfLoader("conf")["catalog"]
+
+    @use_config_dir
+    def test_run_env_changed_after_lookup(self, tmp_path):
+        """Make sure changing the run environment after a lookup loads the config
+        of the new environment"""
+        _write_yaml(tmp_path / "prod" / "catalog.yml", {"planes": {}})
+        config_loader = OmegaConfLoader(str(tmp_path))
+        assert "boats" in config_loader["catalog"]
+
+        config_loader.default_run_env = "prod"
+        catalog = config_loader["catalog"]
+        assert "planes" in catalog
+        assert "boats" not in catalog